@@ -4,14 +4,15 @@
 
 from __future__ import annotations
 
-import json
-import re
 import sqlite3
+import threading
+from functools import lru_cache
 from http import HTTPStatus
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Optional, Tuple
 
-from flask import Flask, Response, jsonify, render_template, request
+import orjson
+from flask import Flask, Response, render_template, request
 from werkzeug.exceptions import BadRequest, HTTPException, NotFound
 
 APP = Flask(__name__)
@@ -19,7 +20,7 @@ APP = Flask(__name__)
 # Allow overriding via environment variable if desired at deploy time.
 DB_PATH = Path(__file__).resolve().parent.parent / "data.db"
 
-ALLOWED_MEASURES = {
+ALLOWED_MEASURES = frozenset({
     "Violent crime rate",
     "Unemployment",
     "Children in poverty",
@@ -32,18 +33,83 @@ ALLOWED_MEASURES = {
     "Adult obesity",
     "Premature Death",
     "Daily fine particulate matter",
-}
-
-ZIP_PATTERN = re.compile(r"^\d{5}$")
+})
+
+LOOKUP_COLUMNS = """
+        chr.state,
+        chr.county,
+        chr.state_code,
+        chr.county_code,
+        chr.year_span,
+        chr.measure_name,
+        chr.measure_id,
+        chr.numerator,
+        chr.denominator,
+        chr.raw_value,
+        chr.confidence_interval_lower_bound,
+        chr.confidence_interval_upper_bound,
+        chr.data_release_year,
+        chr.fipscode
+"""
+
+# Constant error bodies for the common 404 and 418 paths, encoded once.
+NOT_FOUND_BODY = b'{"error":"No matching records found"}\n'
+TEAPOT_BODY = b'{"error":"Request rejected: I\'m a teapot."}\n'
+
+MEASURE_IDS_QUERY = "SELECT measure_name, measure_id FROM measure_ids"
+
+# county_measure is materialized by csv_to_sqlite.py with each zip_county
+# county's matching rankings rows, so the lookup is two indexed range scans.
+# Rows are unique per county already; the rare row shared by two counties of
+# one ZIP is dropped in lookup_county_data rather than with a DISTINCT b-tree.
+LOOKUP_QUERY = f"""
+    SELECT {LOOKUP_COLUMNS}
+    FROM zip_county AS zc
+    INNER JOIN county_measure AS chr
+        ON chr.zip_county_code = zc.county_code
+       AND chr.measure_id = :measure_id
+    WHERE zc.zip = :zip
+    ORDER BY chr.data_release_year ASC, chr.year_span ASC
+"""
+
+# Read-side tuning applied once per connection. data.db ships read-only with the
+# deployment, so journal/synchronous settings are left to csv_to_sqlite.py.
+CONNECTION_PRAGMAS = (
+    "PRAGMA query_only = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -20000",
+    # Map data.db into memory so warm reads skip the per-page read() syscall.
+    "PRAGMA mmap_size = 268435456",
+)
+
+# One long-lived connection per worker thread keeps SQLite's page cache warm
+# between requests instead of reopening data.db every time.
+_LOCAL = threading.local()
+
+# Modification time of data.db that the memoized lookups and open connections
+# were established against; see refresh_if_db_changed().
+_DB_MTIME: Optional[int] = None
 
 
 def get_connection() -> sqlite3.Connection:
-    """Open a SQLite connection with row access by column name."""
+    """Return this thread's SQLite connection, (re)opening it when data.db changed."""
+    connection = getattr(_LOCAL, "connection", None)
+    if connection is not None:
+        if _LOCAL.db_mtime == _DB_MTIME:
+            return connection
+        # data.db was replaced since this connection opened; it may still read the old file.
+        connection.close()
+        _LOCAL.connection = None
+
     if not DB_PATH.exists():
         raise NotFound(description=f"Database not found at {DB_PATH}")
 
-    connection = sqlite3.connect(DB_PATH)
-    connection.row_factory = sqlite3.Row
+    connection = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    for pragma in CONNECTION_PRAGMAS:
+        connection.execute(pragma)
+
+    _LOCAL.connection = connection
+    _LOCAL.db_mtime = _DB_MTIME
     return connection
 
 
@@ -55,7 +121,8 @@ def validate_payload(payload: Dict[str, Any]) -> Dict[str, str]:
     if zip_code is None or measure_name is None:
         raise BadRequest(description="Both 'zip' and 'measure_name' are required")
 
-    if not isinstance(zip_code, str) or not ZIP_PATTERN.match(zip_code):
+    # Plain length/digit checks instead of a regex; isascii() keeps out non-ASCII digits.
+    if not isinstance(zip_code, str) or len(zip_code) != 5 or not (zip_code.isascii() and zip_code.isdigit()):
         raise BadRequest(description="zip must be a 5-digit string")
 
     if not isinstance(measure_name, str):
@@ -67,39 +134,58 @@ def validate_payload(payload: Dict[str, Any]) -> Dict[str, str]:
     return {"zip": zip_code, "measure_name": measure_name}
 
 
-def lookup_county_data(zip_code: str, measure_name: str) -> List[Dict[str, Any]]:
-    """Query data.db for rows matching the requested zip and measure."""
-    query = """
-        SELECT DISTINCT
-            chr.state,
-            chr.county,
-            chr.state_code,
-            chr.county_code,
-            chr.year_span,
-            chr.measure_name,
-            chr.measure_id,
-            chr.numerator,
-            chr.denominator,
-            chr.raw_value,
-            chr.confidence_interval_lower_bound,
-            chr.confidence_interval_upper_bound,
-            chr.data_release_year,
-            chr.fipscode
-        FROM county_health_rankings AS chr
-        INNER JOIN zip_county AS zc
-            ON zc.zip = :zip
-           AND (
-               (chr.fipscode IS NOT NULL AND chr.fipscode = zc.county_code)
-               OR (chr.county = zc.county AND chr.state = zc.state_abbreviation)
-           )
-        WHERE chr.measure_name = :measure
-        ORDER BY chr.data_release_year ASC, chr.year_span ASC
+@lru_cache(maxsize=1)
+def load_measure_ids() -> Dict[str, str]:
+    """Map each allowed measure name to its measure_id, read once per process."""
+    rows = get_connection().execute(MEASURE_IDS_QUERY).fetchall()
+    return {name: measure_id for name, measure_id in rows if name in ALLOWED_MEASURES}
+
+
+@lru_cache(maxsize=4096)
+def lookup_county_data(zip_code: str, measure_name: str) -> Tuple[Dict[str, Any], ...]:
+    """Query data.db for rows matching the requested zip and measure.
+
+    Results are memoized per (zip, measure) pair and shared between callers, so
+    the returned records must not be mutated.
     """
+    measure_id = load_measure_ids().get(measure_name)
+    if measure_id is None:
+        return ()
+
+    connection = get_connection()
+    cursor = connection.execute(LOOKUP_QUERY, {"zip": zip_code, "measure_id": measure_id})
+
+    # Rows come back as plain tuples; resolve the column names once per query.
+    keys = tuple(column[0] for column in cursor.description)
+    rows = dict.fromkeys(cursor)  # order-preserving dedup of identical rows
+    return tuple(dict(zip(keys, row)) for row in rows)
+
+
+def refresh_if_db_changed() -> None:
+    """Drop memoized lookups and stale connections when data.db has been rebuilt."""
+    global _DB_MTIME
+    try:
+        mtime = DB_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return
+
+    if mtime != _DB_MTIME:
+        if _DB_MTIME is not None:
+            lookup_county_data.cache_clear()
+            load_measure_ids.cache_clear()
+        # get_connection() reopens any thread-local connection tagged with an older mtime.
+        _DB_MTIME = mtime
+
+
+def json_response(obj: Any, status: int = HTTPStatus.OK) -> Response:
+    """Serialize obj with orjson into a JSON response."""
+    body = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return Response(body, status=status, mimetype="application/json")
 
-    with get_connection() as connection:
-        rows = connection.execute(query, {"zip": zip_code, "measure": measure_name}).fetchall()
 
-    return [dict(row) for row in rows]
+def error_body(description: str) -> bytes:
+    """Render the fixed {"error": ...} envelope, encoding only the description."""
+    return b'{"error":' + orjson.dumps(description) + b"}\n"
 
 
 @APP.errorhandler(HTTPException)
@@ -109,11 +195,10 @@ def handle_http_exception(error: HTTPException) -> Response:
 
     # werkzeug attaches Response on some exceptions (e.g., IM_A_TEAPOT) - reuse it.
     if error.response is None:
-        response = jsonify({"error": description})
-        response.status_code = error.code or HTTPStatus.INTERNAL_SERVER_ERROR
-        return response
+        status = error.code or HTTPStatus.INTERNAL_SERVER_ERROR
+        return Response(error_body(description), status=status, mimetype="application/json")
 
-    error.response.set_data(json.dumps({"error": description}))
+    error.response.set_data(error_body(description))
     error.response.mimetype = "application/json"
     return error.response
 
@@ -121,30 +206,34 @@ def handle_http_exception(error: HTTPException) -> Response:
 @APP.errorhandler(Exception)
 def handle_unexpected_exception(error: Exception) -> Response:
     """Catch-all error handler that surfaces a JSON response."""
-    response = jsonify({"error": str(error) or "Internal server error"})
-    response.status_code = HTTPStatus.INTERNAL_SERVER_ERROR
-    return response
+    body = error_body(str(error) or "Internal server error")
+    return Response(body, status=HTTPStatus.INTERNAL_SERVER_ERROR, mimetype="application/json")
 
 
 @APP.route("/county_data", methods=["POST"])
 def county_data() -> Response:
     """Return health ranking records for a given ZIP code and measure."""
-    payload = request.get_json(silent=True)
+    # Parse the small body with orjson directly rather than through get_json().
+    payload = None
+    if request.is_json:
+        try:
+            payload = orjson.loads(request.get_data(cache=False))
+        except orjson.JSONDecodeError:
+            pass
     if payload is None:
         raise BadRequest(description="Request body must be JSON")
 
     if payload.get("coffee") == "teapot":
-        response = jsonify({"error": "Request rejected: I'm a teapot."})
-        response.status_code = HTTPStatus.IM_A_TEAPOT
-        return response
+        return Response(TEAPOT_BODY, status=HTTPStatus.IM_A_TEAPOT, mimetype="application/json")
 
     validated = validate_payload(payload)
+    refresh_if_db_changed()
     records = lookup_county_data(validated["zip"], validated["measure_name"])
 
     if not records:
-        raise NotFound(description="No matching records found")
+        return Response(NOT_FOUND_BODY, status=HTTPStatus.NOT_FOUND, mimetype="application/json")
 
-    return jsonify(records)
+    return json_response(records)
 
 
 @APP.route("/")
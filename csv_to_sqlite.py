@@ -5,6 +5,7 @@
 
 import argparse
 import csv
+import itertools
 import sqlite3
 from pathlib import Path
 import re
@@ -13,6 +14,59 @@ from typing import Iterable, List
 
 VALID_IDENTIFIER = re.compile(r"[a-z_][a-z0-9_]*$")
 
+# Rows handed to each executemany call while streaming the CSV.
+BATCH_SIZE = 10_000
+
+# Bulk-load settings: the database is rebuilt from the CSVs, so skip fsyncs and
+# keep temporary b-trees and a large page cache in memory for the load. The
+# larger page size only takes effect when the database file is first created.
+LOAD_PRAGMAS = (
+    "PRAGMA page_size = 8192",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -200000",
+)
+
+# Secondary indexes backing the county_data API lookups, keyed by table name.
+TABLE_INDEXES = {
+    "zip_county": {
+        "idx_zc_zip": ("zip",),
+    },
+    "county_measure": {
+        "idx_cm_county_measure": ("zip_county_code", "measure_id"),
+    },
+}
+
+# county_measure precomputes the FIPS-or-name join between each distinct
+# zip_county county and its county_health_rankings rows, so the API only has
+# to walk zip_county -> county_measure by index. It is keyed per county rather
+# than per ZIP: a per-ZIP copy would repeat each county's rows for every ZIP
+# it contains (millions of rows for the shipped data).
+MATERIALIZED_SOURCES = ("county_health_rankings", "zip_county")
+COUNTY_MEASURE_SQL = """
+    CREATE TABLE county_measure AS
+    WITH counties AS (
+        SELECT DISTINCT county_code, county, state_abbreviation FROM zip_county
+    )
+    SELECT counties.county_code AS zip_county_code, chr.*
+    FROM counties
+    INNER JOIN county_health_rankings AS chr ON chr.fipscode = counties.county_code
+    UNION
+    SELECT counties.county_code AS zip_county_code, chr.*
+    FROM counties
+    INNER JOIN county_health_rankings AS chr
+        ON chr.county = counties.county AND chr.state = counties.state_abbreviation
+    ORDER BY zip_county_code, measure_id
+"""
+
+# measure_ids maps each measure name to its id so the API can read the mapping
+# without scanning county_health_rankings on every cold start.
+MEASURE_IDS_SQL = """
+    CREATE TABLE measure_ids AS
+    SELECT DISTINCT measure_name, measure_id FROM county_health_rankings
+    ORDER BY measure_name
+"""
+
 
 def normalize_identifier(value: str) -> str:
     """Normalize identifiers by trimming whitespace, dropping BOMs, and lowercasing."""
@@ -38,11 +92,39 @@ def create_table(connection: sqlite3.Connection, table_name: str, columns: Itera
 
 
 def insert_rows(connection: sqlite3.Connection, table_name: str, columns: List[str], rows: Iterable[List[str]]) -> None:
-    """Insert the provided rows into the specified table."""
+    """Insert the provided rows into the specified table in batches of BATCH_SIZE."""
     columns_joined = ", ".join(columns)
     placeholders = ", ".join("?" for _ in columns)
     insert_sql = f"INSERT INTO {table_name} ({columns_joined}) VALUES ({placeholders});"
-    connection.executemany(insert_sql, rows)
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, BATCH_SIZE)):
+        connection.executemany(insert_sql, batch)
+
+
+def create_indexes(connection: sqlite3.Connection, table_name: str) -> None:
+    """Create the lookup indexes for a known table and refresh planner statistics."""
+    indexes = TABLE_INDEXES.get(table_name)
+    if not indexes:
+        return
+
+    for index_name, index_columns in indexes.items():
+        columns_joined = ", ".join(index_columns)
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({columns_joined});")
+    connection.execute(f"ANALYZE {table_name};")
+
+
+def materialize_county_measure(connection: sqlite3.Connection) -> None:
+    """Rebuild county_measure and measure_ids once both source tables have been loaded."""
+    existing = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if not existing.issuperset(MATERIALIZED_SOURCES):
+        return
+
+    connection.execute("DROP TABLE IF EXISTS county_measure;")
+    connection.execute(COUNTY_MEASURE_SQL)
+    create_indexes(connection, "county_measure")
+
+    connection.execute("DROP TABLE IF EXISTS measure_ids;")
+    connection.execute(MEASURE_IDS_SQL)
 
 
 def load_csv_to_sqlite(db_path: Path, csv_path: Path) -> None:
@@ -57,12 +139,17 @@ def load_csv_to_sqlite(db_path: Path, csv_path: Path) -> None:
             raise ValueError("CSV file is empty") from exc
 
         columns = [validate_identifier(col, "Column name") for col in header]
-        rows = list(reader)
 
-    with sqlite3.connect(db_path) as connection:
-        create_table(connection, table_name, columns)
-        insert_rows(connection, table_name, columns, rows)
-        connection.commit()
+        with sqlite3.connect(db_path) as connection:
+            for pragma in LOAD_PRAGMAS:
+                connection.execute(pragma)
+            create_table(connection, table_name, columns)
+            # Stream the remaining CSV rows into a single explicit transaction.
+            connection.execute("BEGIN")
+            insert_rows(connection, table_name, columns, reader)
+            create_indexes(connection, table_name)
+            materialize_county_measure(connection)
+            connection.commit()
 
 
 def parse_args(argv: List[str]) -> argparse.Namespace: